@@ -0,0 +1,120 @@
+"""Latency benchmark: MCP over TCP loopback vs the Unix domain socket.
+
+Runs outside Unreal as a plain Python process:
+
+    python bench_transport.py [calls]
+
+Starts mcp_log_forwarder.py in-process on a free port with UNREAL_MCP_SOCKET
+set, and times small tool calls over both transports (median of `calls`,
+default 2000). exec runs a real eval on the main-thread queue: the stand-in
+`unreal` module (mcp_stand_in.py) ticks the queue from a background thread
+every TICK_SECONDS, so exec rows include up to one tick of queue wait on top
+of the transport.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import statistics
+import http.client
+
+import mcp_stand_in
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost", timeout=10)
+        self._socket_path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._socket_path)
+        self.sock = sock
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _call(conn, tool, arguments):
+    body = json.dumps({"tool": tool, "arguments": arguments}).encode("utf-8")
+    conn.request("POST", "/mcp/messages", body=body, headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    data = json.loads(resp.read().decode("utf-8"))
+    if resp.status != 200:
+        raise RuntimeError(f"{tool} failed: HTTP {resp.status} {data}")
+    return data["result"]
+
+
+def _median_us(connect, tool, arguments, calls, reuse=True):
+    conn = connect() if reuse else None
+    samples = []
+    for _ in range(calls):
+        c = conn if reuse else connect()
+        start = time.perf_counter()
+        _call(c, tool, arguments)
+        samples.append(time.perf_counter() - start)
+        if not reuse:
+            c.close()
+    if conn is not None:
+        conn.close()
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tmp = tempfile.mkdtemp(prefix="mcp-bench-")
+    port = _free_port()
+    sock_path = os.path.join(tmp, "mcp.sock")
+    log_path = os.path.join(tmp, "Bench.log")
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write("LogInit: Display: bench\n")
+
+    os.environ.update({
+        "UNREAL_MCP_PORT": str(port),
+        "UNREAL_MCP_SOCKET": sock_path,
+        "UNREAL_MCP_LOG_PATH": log_path,
+        "UNREAL_MCP_REGISTRY_DIR": os.path.join(tmp, "instances"),
+        "UNREAL_MCP_ARCHIVE_INTERVAL": "0",
+        "UNREAL_PROJECT_NAME": "Bench",
+    })
+    mcp_stand_in.install()
+    import mcp_log_forwarder
+
+    deadline = time.time() + 5
+    while not os.path.exists(sock_path) and time.time() < deadline:
+        time.sleep(0.01)
+
+    transports = {
+        "TCP": lambda: http.client.HTTPConnection("127.0.0.1", port, timeout=10),
+        "UDS": lambda: _UnixHTTPConnection(sock_path),
+    }
+
+    # Make sure exec really evaluates instead of returning an error.
+    out = _call(transports["TCP"](), "unreal_logs/exec", {"code": "1 + 1", "mode": "eval"})
+    if not out.get("ok") or out.get("result") != 2:
+        raise RuntimeError(f"exec stand-in failed: {out}")
+
+    rows = [
+        ("`get_log_path`, keep-alive", "unreal_logs/get_log_path", {}, True),
+        ("`exec` (`eval` of `1 + 1`), keep-alive", "unreal_logs/exec", {"code": "1 + 1", "mode": "eval"}, True),
+        ("`get_log_path`, new connection per call", "unreal_logs/get_log_path", {}, False),
+    ]
+
+    print(f"Median of {calls} calls, stand-in tick every {mcp_stand_in.TICK_SECONDS * 1e3:g} ms:")
+    print()
+    print("| Call | TCP | UDS |")
+    print("| --- | --- | --- |")
+    for label, tool, arguments, reuse in rows:
+        cells = [f"{_median_us(connect, tool, arguments, calls, reuse):.0f} us" for connect in transports.values()]
+        print(f"| {label} | {cells[0]} | {cells[1]} |")
+
+    mcp_log_forwarder._stop_server()
+
+
+if __name__ == "__main__":
+    main()
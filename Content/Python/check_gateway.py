@@ -0,0 +1,146 @@
+"""End-to-end check of mcp_gateway.py against two headless editors.
+
+Runs outside Unreal as a plain Python process:
+
+    python check_gateway.py
+
+Starts two mcp_log_forwarder.py servers (projects A and B, with the stand-in
+`unreal` module from mcp_stand_in.py) that register in a temporary
+UNREAL_MCP_REGISTRY_DIR, and a gateway in-process. Then checks routing by
+`instance`, the "several match" error, broadcast merging and that a killed
+server's registry entry is pruned. Exits non-zero on the first failure.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+import subprocess
+import http.client
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+EVAL_PID = {"code": "__import__('os').getpid()", "mode": "eval"}
+
+
+def _serve():
+    """Child process: run one headless editor server until killed."""
+    import mcp_stand_in
+    mcp_stand_in.install()
+    import mcp_log_forwarder
+
+    while mcp_log_forwarder._SERVER_THREAD is not None and mcp_log_forwarder._SERVER_THREAD.is_alive():
+        mcp_log_forwarder._SERVER_THREAD.join(timeout=0.5)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _post(port, tool, arguments):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        body = json.dumps({"tool": tool, "arguments": arguments}).encode("utf-8")
+        conn.request("POST", "/mcp/messages", body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read().decode("utf-8"))
+    finally:
+        conn.close()
+
+
+def _check(cond, what):
+    if not cond:
+        raise AssertionError(what)
+    print(f"ok: {what}")
+
+
+def main():
+    registry_dir = tempfile.mkdtemp(prefix="mcp-gateway-check-")
+    os.environ["UNREAL_MCP_REGISTRY_DIR"] = registry_dir
+    import mcp_registry
+    import mcp_gateway
+
+    editors = {}
+    for project in ("A", "B"):
+        port = _free_port()
+        env = dict(
+            os.environ,
+            UNREAL_MCP_PORT=str(port),
+            UNREAL_PROJECT_NAME=project,
+            UNREAL_MCP_ARCHIVE_INTERVAL="0",
+        )
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve"],
+            cwd=HERE, env=env, stdout=subprocess.DEVNULL,
+        )
+        editors[project] = (proc, port)
+
+    gateway = mcp_gateway.ThreadingHTTPServer(("127.0.0.1", 0), mcp_gateway.GatewayHandler)
+    threading.Thread(target=gateway.serve_forever, daemon=True).start()
+    gw = gateway.server_address[1]
+
+    try:
+        deadline = time.time() + 15
+        while len(mcp_registry.list_instances()) < 2 and time.time() < deadline:
+            time.sleep(0.1)
+        _check(len(mcp_registry.list_instances()) == 2, "both editors registered")
+
+        # Routing by project name and by full instance id
+        for project, (proc, port) in editors.items():
+            for selector in (project, f"{project}:{port}@{proc.pid}"):
+                status, body = _post(gw, "unreal_logs/exec", dict(EVAL_PID, instance=selector))
+                _check(
+                    status == 200 and body["result"]["result"] == proc.pid,
+                    f"instance={selector!r} routes to pid {proc.pid}",
+                )
+
+        status, body = _post(gw, "unreal_logs/get_log_path", {})
+        _check(
+            status == 400 and "Several" in body["error"] and len(body["instances"]) == 2,
+            "call without instance reports several matches",
+        )
+
+        status, body = _post(gw, "unreal_gateway/broadcast", {"tool": "unreal_logs/exec", "arguments": EVAL_PID})
+        result = body["result"]
+        expected = {
+            f"{project}:{port}@{proc.pid}": proc.pid for project, (proc, port) in editors.items()
+        }
+        _check(
+            result["ok"] and {k: v["result"] for k, v in result["results"].items()} == expected,
+            "broadcast merges results keyed by instance id",
+        )
+
+        # A crashed editor never unregisters; its entry must be pruned.
+        proc_b, port_b = editors["B"]
+        proc_b.kill()
+        proc_b.wait()
+        _post(gw, "unreal_gateway/broadcast", {"tool": "unreal_logs/exec", "arguments": EVAL_PID})
+        status, body = _post(gw, "unreal_gateway/list_instances", {})
+        ids = [i["id"] for i in body["result"]["instances"]]
+        _check(ids == [f"A:{editors['A'][1]}@{editors['A'][0].pid}"], "killed editor is no longer listed")
+        _check(
+            not os.path.exists(os.path.join(registry_dir, f"{proc_b.pid}-{port_b}.json")),
+            "killed editor's registry entry is pruned",
+        )
+    finally:
+        gateway.shutdown()
+        for proc, _port in editors.values():
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait()
+
+    print("gateway check passed")
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        _serve()
+    else:
+        try:
+            main()
+        except AssertionError as e:
+            print(f"FAILED: {e}")
+            sys.exit(1)
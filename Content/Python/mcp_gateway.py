@@ -0,0 +1,458 @@
+"""Local MCP gateway in front of every Unreal editor running the plugin.
+
+Runs outside Unreal as a plain Python process:
+
+    python mcp_gateway.py
+
+It speaks the same MCP-like protocol as mcp_log_forwarder.py (GET /mcp,
+POST /mcp/messages) on UNREAL_MCP_GATEWAY_PORT, discovers editors through
+the instance registry (mcp_registry.py) and forwards tool calls over pooled
+keep-alive connections (over the editor's Unix domain socket when it
+registered one, TCP otherwise). Agents pick an editor with the extra "instance"
+argument (id "<project>:<port>@<pid>", "<project>:<port>", port, pid or
+project name) or fan a call out to every editor with unreal_gateway/broadcast.
+"""
+import os
+import json
+import time
+import socket
+import threading
+import http.client
+import http.server
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+
+import mcp_registry
+
+# --- Configuration ---
+GATEWAY_PORT = int(os.getenv("UNREAL_MCP_GATEWAY_PORT", "3000"))
+# Longer than the editor's slowest tool (scene_snapshot waits up to 60s).
+CALL_TIMEOUT = float(os.getenv("UNREAL_MCP_GATEWAY_TIMEOUT", "90"))
+
+POOL_SIZE = 4  # Idle keep-alive connections kept per editor instance
+INSTANCE_RESCAN_SECONDS = 5.0  # Max age of the cached instance list
+BROADCAST_WORKERS = 16  # Concurrent calls during a broadcast
+
+_POOLS = {}  # (host, port) or ("unix", path) -> [idle HTTPConnection]
+_POOLS_LOCK = threading.Lock()
+
+_INSTANCES = None  # (registry dir mtime, scan time, entries)
+_INSTANCES_LOCK = threading.Lock()
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _log_info(msg):
+    print(str(msg))
+
+
+def _log_error(msg):
+    print("ERROR: " + str(msg))
+
+
+# --- Instance discovery ---
+
+def _instance_id(entry):
+    return f"{entry.get('project') or 'unknown'}:{entry['port']}@{entry.get('pid')}"
+
+
+def _describe_instance(entry):
+    return {
+        "id": _instance_id(entry),
+        "project": entry.get("project"),
+        "port": entry["port"],
+        "pid": entry.get("pid"),
+        "host": entry.get("host") or "127.0.0.1",
+        "socket": entry.get("socket"),
+    }
+
+
+def _matches(entry, selector):
+    s = str(selector).strip().lower()
+    project = str(entry.get("project") or "").lower()
+    return s in (
+        _instance_id(entry).lower(),
+        f"{project or 'unknown'}:{entry['port']}",
+        str(entry["port"]),
+        str(entry.get("pid")),
+        project,
+    )
+
+
+def _registry_mtime():
+    try:
+        return os.stat(mcp_registry.REGISTRY_DIR).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _instances():
+    """Registry entries, re-scanned when the registry changes or the cache ages out."""
+    global _INSTANCES
+    # Read before scanning so an entry written during the scan triggers another one.
+    mtime = _registry_mtime()
+    now = time.monotonic()
+    with _INSTANCES_LOCK:
+        cached = _INSTANCES
+    if cached is not None and cached[0] == mtime and now - cached[1] < INSTANCE_RESCAN_SECONDS:
+        return cached[2]
+
+    entries = mcp_registry.list_instances()
+    with _INSTANCES_LOCK:
+        _INSTANCES = (mtime, now, entries)
+    return entries
+
+
+def _invalidate_instances():
+    """Re-validate every instance on the next call (e.g. after one was unreachable)."""
+    global _INSTANCES
+    with _INSTANCES_LOCK:
+        _INSTANCES = None
+
+
+def _select_instances(selector=None):
+    """Return registry entries matching selector (a value or list); all when omitted."""
+    instances = _instances()
+    if selector is None or selector == "" or selector == []:
+        return instances
+    selectors = selector if isinstance(selector, (list, tuple)) else [selector]
+    return [e for e in instances if any(_matches(e, s) for s in selectors)]
+
+
+# --- Pooled forwarding ---
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection to an editor's Unix domain socket (UNREAL_MCP_SOCKET)."""
+
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socket_path)
+        except Exception:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _connection_key(entry):
+    path = entry.get("socket")
+    if path and hasattr(socket, "AF_UNIX") and os.path.exists(path):
+        return ("unix", path)
+    return (entry.get("host") or "127.0.0.1", int(entry["port"]))
+
+
+def _new_connection(key):
+    if key[0] == "unix":
+        return _UnixHTTPConnection(key[1], timeout=CALL_TIMEOUT)
+    return http.client.HTTPConnection(key[0], key[1], timeout=CALL_TIMEOUT)
+
+
+def _acquire(key):
+    with _POOLS_LOCK:
+        idle = _POOLS.get(key)
+        if idle:
+            return idle.pop()
+    return None
+
+
+def _release(key, conn):
+    with _POOLS_LOCK:
+        idle = _POOLS.setdefault(key, [])
+        if len(idle) < POOL_SIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+# Errors from writing to / reading from a pooled connection the editor already closed.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+def _request(entry, method, path, payload=None):
+    """Send one request to an editor instance. Returns (status, decoded JSON body)."""
+    key = _connection_key(entry)
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+
+    for attempt in (0, 1):
+        conn = _acquire(key)
+        reused = conn is not None
+        if conn is None:
+            conn = _new_connection(key)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE_CONNECTION_ERRORS:
+            conn.close()
+            # An idle pooled connection may have been closed by the editor; retry once fresh.
+            # Timeouts and other errors are never retried: the editor may already be
+            # running the call (e.g. exec), and resending would run it twice.
+            if reused and attempt == 0:
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+
+        if resp.will_close:
+            conn.close()
+        else:
+            _release(key, conn)
+
+        try:
+            decoded = json.loads(data.decode("utf-8")) if data else {}
+        except ValueError:
+            decoded = {"error": data.decode("utf-8", errors="replace")}
+        return resp.status, decoded
+
+
+def _call_instance(entry, tool, arguments):
+    """Call a tool on one instance; never raises."""
+    out = {"instance": _instance_id(entry)}
+    try:
+        status, body = _request(entry, "POST", "/mcp/messages", {"tool": tool, "arguments": arguments})
+    except Exception as e:
+        _invalidate_instances()
+        out.update({"ok": False, "error": f"Instance unreachable: {e}"})
+        return out
+    if status == 200:
+        out.update({"ok": True, "result": body.get("result")})
+    else:
+        out.update({"ok": False, "status": status, "error": body.get("error", f"HTTP {status}")})
+    return out
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=BROADCAST_WORKERS, thread_name_prefix="mcp-gateway")
+        return _EXECUTOR
+
+
+# --- Gateway tools ---
+
+def list_instances():
+    """Return every registered editor instance."""
+    return {"instances": [_describe_instance(e) for e in _select_instances()]}
+
+
+def broadcast(tool, arguments=None, instances=None):
+    """Call a tool on several editor instances concurrently and merge the results.
+
+    Parameters:
+    - tool: tool name as exposed by the editors (e.g. "unreal_logs/get_log_path")
+    - arguments: tool arguments, sent unchanged to every instance
+    - instances: optional selector or list of selectors; all instances when omitted
+    """
+    if not tool:
+        return {"ok": False, "error": "Missing required argument: tool"}
+    if str(tool).startswith("unreal_gateway/"):
+        return {"ok": False, "error": "Gateway tools cannot be broadcast"}
+
+    targets = _select_instances(instances)
+    arguments = arguments or {}
+    executor = _get_executor()
+    calls = [executor.submit(_call_instance, e, tool, arguments) for e in targets]
+
+    results = {}
+    errors = {}
+    for call in calls:
+        out = call.result()
+        if out["ok"]:
+            results[out["instance"]] = out["result"]
+        else:
+            errors[out["instance"]] = out["error"]
+
+    return {
+        "ok": not errors,
+        "tool": tool,
+        "count": len(targets),
+        "results": results,
+        "errors": errors,
+    }
+
+
+GATEWAY_TOOLS = {
+    "unreal_gateway/list_instances": {
+        "description": "Lists the Unreal editor instances known to the gateway (id, project, port, pid).",
+        "function": list_instances,
+        "parameters": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    "unreal_gateway/broadcast": {
+        "description": "Calls one editor tool on several (default: all) Unreal editor instances concurrently. Returns results and errors keyed by instance id.",
+        "function": broadcast,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "tool": {
+                    "type": "string",
+                    "description": "Editor tool name, e.g. 'unreal_logs/exec'."
+                },
+                "arguments": {
+                    "type": "object",
+                    "description": "Arguments passed to the tool on every instance."
+                },
+                "instances": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional instance ids, ports, pids or project names to target."
+                }
+            },
+            "required": ["tool"]
+        }
+    }
+}
+
+INSTANCE_PARAMETER = {
+    "type": "string",
+    "description": "Editor to call: instance id '<project>:<port>@<pid>', '<project>:<port>', port, pid or project name. Optional when only one editor is running.",
+}
+
+
+def _editor_tools():
+    """Fetch tool definitions from the first reachable instance."""
+    for entry in _select_instances():
+        try:
+            status, body = _request(entry, "GET", "/mcp")
+        except Exception:
+            _invalidate_instances()
+            continue
+        if status == 200:
+            return body.get("tools", [])
+    return []
+
+
+def _forward(tool, arguments):
+    """Route one editor tool call. Returns (status, body)."""
+    selector = arguments.pop("instance", None)
+    targets = _select_instances(selector)
+    if not targets:
+        known = [_instance_id(e) for e in _select_instances()]
+        return 400, {"error": f"No running Unreal instance matches {selector!r}", "instances": known}
+    if len(targets) > 1:
+        return 400, {
+            "error": "Several Unreal instances match; pass the 'instance' argument",
+            "instances": [_instance_id(e) for e in targets],
+        }
+
+    try:
+        return _request(targets[0], "POST", "/mcp/messages", {"tool": tool, "arguments": arguments})
+    except Exception as e:
+        _invalidate_instances()
+        return 502, {"error": f"Instance {_instance_id(targets[0])} unreachable: {e}"}
+
+
+# --- Gateway HTTP Server ---
+
+class GatewayHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the MCP protocol and forwards editor tools to registered instances."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = 120  # Close idle keep-alive connections
+    # Headers and body are written separately; without TCP_NODELAY a reused
+    # connection stalls on delayed ACKs for ~40ms per response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        """Handle tool discovery request (GET /mcp)."""
+        if self.path != '/mcp':
+            self._send_404()
+            return
+
+        tool_definitions = []
+        for name, tool_data in GATEWAY_TOOLS.items():
+            tool_definitions.append({
+                "name": name,
+                "description": tool_data["description"],
+                "parameters": tool_data["parameters"],
+            })
+
+        for tool in _editor_tools():
+            params = dict(tool.get("parameters") or {"type": "object"})
+            props = dict(params.get("properties") or {})
+            props["instance"] = INSTANCE_PARAMETER
+            params["properties"] = props
+            tool_definitions.append({
+                "name": tool.get("name"),
+                "description": tool.get("description"),
+                "parameters": params,
+            })
+
+        self._send_json(200, {"tools": tool_definitions})
+
+    def do_POST(self):
+        """Handle tool call request (POST /mcp/messages)."""
+        if self.path != '/mcp/messages':
+            self._send_404()
+            return
+
+        try:
+            content_length = int(self.headers['Content-Length'])
+            payload = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            tool_name = payload.get("tool")
+            arguments = dict(payload.get("arguments") or {})
+
+            tool_data = GATEWAY_TOOLS.get(tool_name)
+            if tool_data is not None:
+                import inspect
+                func_params = inspect.signature(tool_data["function"]).parameters
+                filtered_arguments = {k: v for k, v in arguments.items() if k in func_params}
+                self._send_json(200, {"result": tool_data["function"](**filtered_arguments)})
+                return
+
+            if not tool_name:
+                self._send_json(400, {"error": f"Tool not found or invalid: {tool_name}"})
+                return
+
+            status, body = _forward(tool_name, arguments)
+            self._send_json(status, body)
+        except Exception as e:
+            _log_error(f"MCP Gateway error during POST: {e}")
+            self._send_json(500, {"error": str(e)})
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_404(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", GATEWAY_PORT), GatewayHandler)
+    _log_info(f"MCP Gateway listening on http://localhost:{GATEWAY_PORT} (registry: {mcp_registry.REGISTRY_DIR})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
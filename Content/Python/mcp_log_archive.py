@@ -0,0 +1,597 @@
+"""Compressed, indexed archive of finished Unreal log files.
+
+Finished logs (rotated "-backup-" files and logs of earlier sessions) are
+split into segments of SEGMENT_LINES lines. A segment file is a sequence of
+independently compressed blocks of BLOCK_LINES lines (gzip or lzma; the file
+is still a valid multi-member archive) with a JSON sidecar index next to it:
+
+- time range of the segment (Unreal log timestamps, UTC)
+- per log category, a bitmap of the verbosities seen (VERBOSITY_BITS)
+- line numbers per "category|verbosity" for Fatal/Error/Warning lines
+- an inverted index token -> line numbers for Error/Fatal lines
+- byte offset, length and start time of every block
+
+A catalog.json in the archive directory collects the per-segment summaries
+so a search can rule segments out by time/category/verbosity without
+opening them. For the remaining ones the line indexes pick candidate lines
+and only the blocks holding them are decompressed; searches the indexes do
+not cover decompress whole segments.
+
+Plain Python, no Unreal dependency; mcp_log_forwarder.py drives it.
+"""
+import os
+import re
+import gzip
+import copy
+import json
+import lzma
+import time
+import hashlib
+import calendar
+import threading
+
+SEGMENT_LINES = 50000  # Lines per segment file
+BLOCK_LINES = 1000  # Lines per independently compressed block
+SETTLE_SECONDS = 60  # Logs modified more recently than this are assumed live
+SEARCH_LIMIT = 1000  # Safety cap on returned matches
+
+
+def _gzip_compress(data):
+    return gzip.compress(data, compresslevel=6)
+
+
+# codec -> (file extension, stream opener, compress, decompress)
+CODECS = {
+    "gzip": (".log.gz", gzip.open, _gzip_compress, gzip.decompress),
+    "lzma": (".log.xz", lzma.open, lzma.compress, lzma.decompress),
+}
+
+VERBOSITY_BITS = {
+    "Fatal": 1,
+    "Error": 2,
+    "Warning": 4,
+    "Display": 8,
+    "Log": 16,
+    "Verbose": 32,
+    "VeryVerbose": 64,
+}
+ERROR_MASK = VERBOSITY_BITS["Fatal"] | VERBOSITY_BITS["Error"]  # Levels covered by the token index
+ENTRY_MASK = ERROR_MASK | VERBOSITY_BITS["Warning"]  # Levels with per-category line lists
+
+# [2024.05.01-12.34.56:789][  0]LogShaderCompilers: Error: message
+_LINE_RE = re.compile(
+    r"^(?:\[(\d{4})\.(\d{2})\.(\d{2})-(\d{2})\.(\d{2})\.(\d{2}):(\d{3})\]\[\s*\d+\])?"
+    r"([A-Za-z_][A-Za-z0-9_]*): (?:(Fatal|Error|Warning|Display|Log|Verbose|VeryVerbose): )?"
+)
+_TOKEN_RE = re.compile(r"[a-z0-9_]{2,}")
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$")
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+_LOCK = threading.RLock()  # Guards the catalog cache and catalog.json; held only briefly
+_INGEST_LOCK = threading.Lock()  # Serializes ingestion passes
+_CATALOG_CACHE = {}  # catalog path -> (mtime, catalog)
+# Per-segment fields kept in catalog.json (sidecars hold these plus the line indexes)
+_SUMMARY_KEYS = ("source", "file", "codec", "first_line", "lines", "t_min", "t_max", "categories")
+
+
+# --- Parsing ---
+
+def parse_line(line, prev=None):
+    """Return (time, category, verbosity) for a log line.
+
+    Lines that do not start a log entry (e.g. callstack continuation lines)
+    inherit the attributes of the previous entry passed as prev.
+    """
+    m = _LINE_RE.match(line)
+    if m is None:
+        return prev if prev is not None else (None, None, "Log")
+
+    t = None
+    if m.group(1):
+        try:
+            t = calendar.timegm((
+                int(m.group(1)), int(m.group(2)), int(m.group(3)),
+                int(m.group(4)), int(m.group(5)), int(m.group(6)),
+            )) + int(m.group(7)) / 1000.0
+        except (ValueError, OverflowError):
+            t = None
+    if t is None and prev is not None:
+        t = prev[0]
+    return t, m.group(8), m.group(9) or "Log"
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def parse_time_arg(value, now=None):
+    """Parse a since/until argument into epoch seconds (UTC).
+
+    Accepts epoch seconds, relative durations ("30m", "24h", "7d", "2w": that
+    long before now), ISO dates ("2024-05-01", "2024-05-01T12:00:00") and
+    Unreal log stamps ("2024.05.01-12.34.56"). Returns None for empty input.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    s = str(value).strip()
+    m = _DURATION_RE.match(s)
+    if m:
+        now = time.time() if now is None else now
+        return now - float(m.group(1)) * _DURATION_UNITS[m.group(2)]
+
+    try:
+        return float(s)
+    except ValueError:
+        pass
+
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y.%m.%d-%H.%M.%S", "%Y.%m.%d"):
+        try:
+            return float(calendar.timegm(time.strptime(s.rstrip("Z"), fmt)))
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized time value: {value!r}")
+
+
+def _format_time(t):
+    if t is None:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + f".{int(round((t % 1) * 1000)):03d}Z"
+
+
+# --- Catalog ---
+
+def _catalog_path(archive_dir):
+    return os.path.join(archive_dir, "catalog.json")
+
+
+def _tmp_path(path):
+    # Unique per process and thread: editors of one project share the archive directory.
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def _write_json(path, obj):
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_catalog(archive_dir):
+    """Return the archive catalog, cached until catalog.json changes on disk.
+
+    The cached dict is shared with concurrent searches; never mutate it.
+    """
+    path = _catalog_path(archive_dir)
+    with _LOCK:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {"version": 1, "sources": {}, "segments": {}}
+
+        cached = _CATALOG_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except ValueError:
+            # Corrupt catalog (e.g. interrupted write); the sidecars hold everything needed.
+            catalog = _rebuild_catalog(archive_dir)
+            _write_json(path, catalog)
+            mtime = os.path.getmtime(path)
+        _CATALOG_CACHE[path] = (mtime, catalog)
+        return catalog
+
+
+def _rebuild_catalog(archive_dir):
+    """Recreate the catalog from the segment sidecars.
+
+    Source bookkeeping is lost, so the next ingest pass re-reads every finished
+    log; unchanged logs map to the same segment ids and overwrite their segments.
+    """
+    catalog = {"version": 1, "sources": {}, "segments": {}}
+    for name in sorted(os.listdir(archive_dir)):
+        if not name.endswith(".idx.json"):
+            continue
+        seg_id = name[:-len(".idx.json")]
+        try:
+            with open(os.path.join(archive_dir, name), "r", encoding="utf-8") as f:
+                sidecar = json.load(f)
+            summary = {k: sidecar[k] for k in _SUMMARY_KEYS}
+        except (OSError, ValueError, KeyError):
+            continue
+        if os.path.exists(os.path.join(archive_dir, summary["file"])):
+            catalog["segments"][seg_id] = summary
+    return catalog
+
+
+def _save_catalog(archive_dir, catalog):
+    """Write catalog.json and make catalog the one searches see."""
+    path = _catalog_path(archive_dir)
+    with _LOCK:
+        _write_json(path, catalog)
+        try:
+            _CATALOG_CACHE[path] = (os.path.getmtime(path), catalog)
+        except OSError:
+            _CATALOG_CACHE.pop(path, None)
+
+
+# --- Ingestion ---
+
+def _drop_segments(catalog, segment_ids):
+    """Remove segments from catalog. Returns their file names, to delete once catalog is saved."""
+    names = []
+    for seg_id in segment_ids:
+        seg = catalog["segments"].pop(seg_id, None)
+        if seg is not None:
+            names += [seg["file"], seg_id + ".idx.json"]
+    return names
+
+
+def _write_segment(archive_dir, seg_id, source, first_line, lines, codec):
+    """Compress one segment and write its sidecar index. Returns the catalog summary."""
+    ext, _opener, compress, _decompress = CODECS[codec]
+    file_name = seg_id + ext
+
+    t_min = None
+    t_max = None
+    categories = {}
+    entries = {}
+    tokens = {}
+    block_times = []
+    prev = None
+    for i, line in enumerate(lines):
+        prev = parse_line(line, prev)
+        t, category, verbosity = prev
+        if i % BLOCK_LINES == 0:
+            block_times.append(t)
+        if t is not None:
+            if t_min is None or t < t_min:
+                t_min = t
+            if t_max is None or t > t_max:
+                t_max = t
+        bit = VERBOSITY_BITS.get(verbosity, 0)
+        key = category or ""
+        categories[key] = categories.get(key, 0) | bit
+        if bit & ENTRY_MASK:
+            entries.setdefault(f"{key}|{verbosity}", []).append(i)
+        if bit & ERROR_MASK:
+            for token in set(tokenize(line)):
+                postings = tokens.get(token)
+                if postings is None:
+                    tokens[token] = [i]
+                else:
+                    postings.append(i)
+
+    blocks = []
+    tmp = _tmp_path(os.path.join(archive_dir, file_name))
+    with open(tmp, "wb") as f:
+        for b in range(0, len(lines), BLOCK_LINES):
+            data = compress(("\n".join(lines[b:b + BLOCK_LINES]) + "\n").encode("utf-8"))
+            blocks.append([f.tell(), len(data), block_times[b // BLOCK_LINES]])
+            f.write(data)
+    os.replace(tmp, os.path.join(archive_dir, file_name))
+
+    summary = {
+        "source": source,
+        "file": file_name,
+        "codec": codec,
+        "first_line": first_line,
+        "lines": len(lines),
+        "t_min": t_min,
+        "t_max": t_max,
+        "categories": categories,
+    }
+    sidecar = dict(summary)
+    sidecar["entries"] = entries
+    sidecar["tokens"] = tokens
+    sidecar["block_lines"] = BLOCK_LINES
+    sidecar["blocks"] = blocks
+    _write_json(os.path.join(archive_dir, seg_id + ".idx.json"), sidecar)
+    return summary
+
+
+def _ingest_file(archive_dir, catalog, path, stat, codec):
+    name = os.path.basename(path)
+    digest = hashlib.sha1(f"{path}|{stat.st_size}|{stat.st_mtime}".encode("utf-8")).hexdigest()[:12]
+    segment_ids = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        chunk = []
+        first_line = 1
+        for line in f:
+            chunk.append(line.rstrip("\r\n"))
+            if len(chunk) >= SEGMENT_LINES:
+                seg_id = f"{digest}-{len(segment_ids):04d}"
+                catalog["segments"][seg_id] = _write_segment(archive_dir, seg_id, name, first_line, chunk, codec)
+                segment_ids.append(seg_id)
+                first_line += len(chunk)
+                chunk = []
+        if chunk:
+            seg_id = f"{digest}-{len(segment_ids):04d}"
+            catalog["segments"][seg_id] = _write_segment(archive_dir, seg_id, name, first_line, chunk, codec)
+            segment_ids.append(seg_id)
+    return segment_ids
+
+
+def ingest_logs(log_files, archive_dir, codec="gzip", settle_seconds=SETTLE_SECONDS):
+    """Archive finished log files that are new or changed since they were last ingested.
+
+    Files modified within settle_seconds are skipped as possibly still being
+    written. Returns counts of ingested/skipped files and written segments.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown archive codec {codec!r}; expected one of {sorted(CODECS)}")
+
+    stats = {"ingested": 0, "unchanged": 0, "skipped_live": 0, "segments": 0, "errors": []}
+    now = time.time()
+    # Parsing and compression run outside _LOCK: searches keep using the cached
+    # catalog until the copy built here is saved over it.
+    with _INGEST_LOCK:
+        os.makedirs(archive_dir, exist_ok=True)
+        catalog = copy.deepcopy(load_catalog(archive_dir))
+        changed = False
+        stale_files = []
+
+        for path in log_files:
+            path = os.path.abspath(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            known = catalog["sources"].get(path)
+            if known and known["size"] == st.st_size and known["mtime"] == st.st_mtime:
+                stats["unchanged"] += 1
+                continue
+            if now - st.st_mtime < settle_seconds:
+                stats["skipped_live"] += 1
+                continue
+
+            try:
+                segment_ids = _ingest_file(archive_dir, catalog, path, st, codec)
+            except Exception as e:
+                stats["errors"].append(f"{path}: {e}")
+                continue
+
+            if known:
+                stale_files += _drop_segments(catalog, [s for s in known["segments"] if s not in segment_ids])
+            catalog["sources"][path] = {
+                "name": os.path.basename(path),
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "segments": segment_ids,
+            }
+            stats["ingested"] += 1
+            stats["segments"] += len(segment_ids)
+            changed = True
+
+        if changed:
+            _save_catalog(archive_dir, catalog)
+        # Searches still holding the previous catalog skip segments deleted here.
+        for name in stale_files:
+            try:
+                os.remove(os.path.join(archive_dir, name))
+            except OSError:
+                pass
+    return stats
+
+
+# --- Search ---
+
+def _load_sidecar(archive_dir, seg_id):
+    with open(os.path.join(archive_dir, seg_id + ".idx.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _entry_attrs(lines, i):
+    """Attributes of line i, walking back to the start of its log entry."""
+    j = i
+    while j > 0 and _LINE_RE.match(lines[j]) is None:
+        j -= 1
+    return parse_line(lines[j])
+
+
+def _read_segment(archive_dir, seg):
+    _ext, opener, _compress, _decompress = CODECS[seg["codec"]]
+    with opener(os.path.join(archive_dir, seg["file"]), "rb") as f:
+        return f.read().decode("utf-8", errors="replace").split("\n")[:seg["lines"]]
+
+
+def _scan_rows(lines, words):
+    """Yield (index, line, attrs) for every line of a segment that may contain words."""
+    if not words:
+        prev = None
+        for i, line in enumerate(lines):
+            prev = parse_line(line, prev)
+            yield i, line, prev
+        return
+
+    for i, line in enumerate(lines):
+        # Cheap substring pre-check; exact word matching is done by the caller.
+        low = line.lower()
+        if all(w in low for w in words):
+            yield i, line, _entry_attrs(lines, i)
+
+
+def _indexed_rows(archive_dir, seg, sidecar, attrs_of, line_numbers):
+    """Yield (index, line, attrs) for indexed lines, decompressing only their blocks."""
+    _ext, _opener, _compress, decompress = CODECS[seg["codec"]]
+    block_lines = sidecar["block_lines"]
+    blocks = sidecar["blocks"]
+
+    with open(os.path.join(archive_dir, seg["file"]), "rb") as f:
+        current = None
+        text_lines = []
+        block_time = None
+        for i in sorted(line_numbers):
+            b = i // block_lines
+            if b != current:
+                offset, length, block_time = blocks[b]
+                f.seek(offset)
+                text_lines = decompress(f.read(length)).decode("utf-8", errors="replace").split("\n")
+                current = b
+
+            k = i - b * block_lines
+            # Time of the nearest timestamped line at or above this one in the block.
+            t = block_time
+            for j in range(k, -1, -1):
+                m = _LINE_RE.match(text_lines[j])
+                if m is not None and m.group(1):
+                    t = parse_line(text_lines[j])[0]
+                    break
+
+            category, verbosity = attrs_of[i]
+            yield i, text_lines[k], (t, category, verbosity)
+
+
+def search_archive(archive_dir, text=None, category=None, verbosity=None, since=None, until=None, limit=200):
+    """Search archived log segments, opening only segments the indexes cannot rule out.
+
+    Parameters:
+    - text: words that must all appear in a line (whole words, case-insensitive)
+    - category: log category or list of categories (e.g. "LogShaderCompilers")
+    - verbosity: verbosity name or list (e.g. "Error"); any when omitted
+    - since / until: time bounds, see parse_time_arg
+    - limit: maximum matches returned (newest segments first)
+    """
+    started = time.perf_counter()
+
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        limit = 200
+    limit = max(1, min(limit, SEARCH_LIMIT))
+
+    t_since = parse_time_arg(since)
+    t_until = parse_time_arg(until)
+
+    if isinstance(category, str):
+        category = [category]
+    categories = {str(c).lower() for c in category} if category else None
+
+    if isinstance(verbosity, str):
+        verbosity = [verbosity]
+    mask = 0
+    for v in verbosity or ():
+        name = next((n for n in VERBOSITY_BITS if n.lower() == str(v).lower()), None)
+        if name is None:
+            raise ValueError(f"Unknown verbosity {v!r}; expected one of {list(VERBOSITY_BITS)}")
+        mask |= VERBOSITY_BITS[name]
+    if mask == 0:
+        mask = sum(VERBOSITY_BITS.values())
+
+    words = sorted(set(tokenize(text))) if text else []
+    # Line-level indexes only cover the rare levels, so they can only narrow searches
+    # restricted to those levels.
+    use_entries = not (mask & ~ENTRY_MASK)
+    use_tokens = bool(words) and not (mask & ~ERROR_MASK)
+
+    catalog = load_catalog(archive_dir)
+    segments = sorted(
+        catalog["segments"].items(),
+        key=lambda kv: (kv[1]["t_min"] is None, -(kv[1]["t_max"] or 0), kv[0]),
+    )
+
+    matches = []
+    truncated = False
+    searched = 0
+    skipped = 0
+    for seg_id, seg in segments:
+        # 1) Time range
+        if t_since is not None and seg["t_max"] is not None and seg["t_max"] < t_since:
+            continue
+        if t_until is not None and seg["t_min"] is not None and seg["t_min"] > t_until:
+            continue
+
+        # 2) Category/verbosity bitmaps
+        wanted_cats = [
+            c for c, bits in seg["categories"].items()
+            if bits & mask and (categories is None or c.lower() in categories)
+        ]
+        if not wanted_cats:
+            continue
+
+        # 3) Line-level entry and error token indexes (tokens imply entries)
+        sidecar = None
+        candidate_lines = None
+        words_indexed = False
+        if use_entries:
+            try:
+                sidecar = _load_sidecar(archive_dir, seg_id)
+            except Exception:
+                sidecar = None
+            if sidecar is not None:
+                attrs_of = {}
+                for key, postings in sidecar.get("entries", {}).items():
+                    cat, _sep, verb = key.rpartition("|")
+                    if VERBOSITY_BITS.get(verb, 0) & mask and (categories is None or cat.lower() in categories):
+                        for i in postings:
+                            attrs_of[i] = (cat or None, verb)
+                candidate_lines = set(attrs_of)
+            if sidecar is not None and use_tokens:
+                tokens = sidecar.get("tokens", {})
+                postings = [tokens.get(w) for w in words]
+                if not all(postings):
+                    continue
+                for p in postings:
+                    candidate_lines = set(p) if candidate_lines is None else candidate_lines & set(p)
+                words_indexed = True
+            if candidate_lines is not None and not candidate_lines:
+                continue
+
+        # 4) Decompress and filter lines
+        searched += 1
+        check_time = (t_since is not None and (seg["t_min"] is None or seg["t_min"] < t_since)) or (
+            t_until is not None and (seg["t_max"] is None or seg["t_max"] > t_until)
+        )
+        try:
+            if candidate_lines is not None:
+                rows = _indexed_rows(archive_dir, seg, sidecar, attrs_of, candidate_lines)
+            else:
+                rows = _scan_rows(_read_segment(archive_dir, seg), words)
+            for i, line, (t, cat, verb) in rows:
+                if not VERBOSITY_BITS.get(verb, 0) & mask:
+                    continue
+                if categories is not None and (cat or "").lower() not in categories:
+                    continue
+                if check_time and t is not None:
+                    if (t_since is not None and t < t_since) or (t_until is not None and t > t_until):
+                        continue
+                if words and not words_indexed:
+                    line_tokens = set(tokenize(line))
+                    if not all(w in line_tokens for w in words):
+                        continue
+                matches.append({
+                    "source": seg["source"],
+                    "line": seg["first_line"] + i,
+                    "time": _format_time(t),
+                    "category": cat,
+                    "verbosity": verb,
+                    "text": line,
+                })
+                if len(matches) >= limit:
+                    truncated = True
+                    break
+        except OSError:
+            # Segment removed by a concurrent ingest of a changed source log.
+            searched -= 1
+            skipped += 1
+            continue
+        if truncated:
+            break
+
+    return {
+        "ok": True,
+        "matches": matches,
+        "truncated": truncated,
+        "stats": {
+            "segments_total": len(segments),
+            "segments_searched": searched,
+            "segments_skipped": skipped,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+        },
+    }
@@ -4,15 +4,30 @@ import threading
 import http.server
 import socketserver
 import glob
+import collections
 
 try:
     import unreal
 except Exception:
     unreal = None
 
+try:
+    import mcp_registry
+except Exception:
+    mcp_registry = None
+
+try:
+    import mcp_log_archive
+except Exception:
+    mcp_log_archive = None
+
 # --- Configuration ---
 MCP_PORT = int(os.getenv("UNREAL_MCP_PORT", "3001"))
 
+# Optional Unix domain socket served alongside TCP for same-machine clients.
+# "{port}" and "{pid}" are substituted so several editors can share one setting.
+MCP_SOCKET_PATH = os.getenv("UNREAL_MCP_SOCKET")
+
 # Optional overrides
 # - UNREAL_MCP_LOG_PATH: absolute path to a specific log file
 # - UNREAL_PROJECT_NAME: used if Unreal API is not available
@@ -21,10 +36,24 @@ LOG_PATH_OVERRIDE = os.getenv("UNREAL_MCP_LOG_PATH")
 RETURN_LOG_LINES = 500  # Default lines to return per tool call
 LOG_LINE_LIMIT = 5000  # Safety cap on returned lines
 
+# Background archiving of finished logs (see mcp_log_archive.py)
+# - UNREAL_MCP_ARCHIVE_INTERVAL: seconds between passes, 0 disables the archiver
+# - UNREAL_MCP_ARCHIVE_DIR: archive location (default <log dir>/MCPArchive)
+# - UNREAL_MCP_ARCHIVE_CODEC: "gzip" (default) or "lzma"
+ARCHIVE_INTERVAL = float(os.getenv("UNREAL_MCP_ARCHIVE_INTERVAL", "300"))
+ARCHIVE_DIR_OVERRIDE = os.getenv("UNREAL_MCP_ARCHIVE_DIR")
+ARCHIVE_CODEC = os.getenv("UNREAL_MCP_ARCHIVE_CODEC", "gzip")
+
+# Max jobs waiting for the editor main thread; further requests are rejected as busy.
+MAIN_THREAD_QUEUE_LIMIT = int(os.getenv("UNREAL_MCP_QUEUE_LIMIT", "64"))
+EXEC_TIMEOUT = 10.0  # Seconds exec waits for the main thread before giving up
+
 _CACHED_LOG_PATH = None
 _CACHED_SEARCH = None
 
-_MAIN_THREAD_QUEUE = []
+_MAIN_THREAD_QUEUE = []  # job dicts, see _submit_main_thread_job
+_MAIN_THREAD_INFLIGHT = {}  # dedupe key -> queued job shared by concurrent callers
+_MAIN_THREAD_REQUEUE = object()  # job result meaning "run me again next tick"
 _MAIN_THREAD_LOCK = threading.Lock()
 _MAIN_THREAD_INIT = False
 _MAIN_THREAD_READY = False
@@ -33,8 +62,22 @@ _MAIN_THREAD_IDENT = None
 _TICK_HANDLE = None
 _TICK_KIND = None  # "editor", "slate_post", or "slate_pre"
 
+SCENE_SLICE_BUDGET_MS = 4.0  # Main-thread time per tick spent fingerprinting actors
+SCENE_SNAPSHOT_TIMEOUT = 60.0  # Seconds a request waits for a full sliced scan
+SCENE_LOCK_TIMEOUT = 5.0  # Seconds a request waits for another request's scan to finish
+SCENE_JOURNAL_LIMIT = 200000  # Change entries kept for resolving version tokens (per store)
+SCENE_STORE_LIMIT = 4  # Property lists tracked at once, least recently used dropped first
+
+_SCENE_LOCK = threading.Lock()  # One sliced scan in flight per request thread
+_SCENE_STORES = collections.OrderedDict()  # properties tuple -> store, see _scene_store
+
 _SERVER = None
 _SERVER_THREAD = None
+_UDS_SERVER = None
+_UDS_THREAD = None
+_UDS_PATH = None
+_ARCHIVER_THREAD = None
+_ARCHIVER_STOP = None
 
 
 def _log_info(msg):
@@ -104,16 +147,14 @@ def _ensure_main_thread_runner():
         if _MAIN_THREAD_IDENT is None:
             _MAIN_THREAD_IDENT = _safe_get_ident()
 
-        # Drain queue
-        while True:
-            with _MAIN_THREAD_LOCK:
-                if not _MAIN_THREAD_QUEUE:
-                    break
-                fn = _MAIN_THREAD_QUEUE.pop(0)
-            try:
-                fn()
-            except Exception as e:
-                _log_error(f"Main-thread task failed: {e}")
+        # Drain only what was queued before this tick. Jobs queued while draining
+        # (e.g. time-sliced work re-queuing itself) run on the next tick.
+        with _MAIN_THREAD_LOCK:
+            pending = _MAIN_THREAD_QUEUE[:]
+            del _MAIN_THREAD_QUEUE[:]
+
+        for job in pending:
+            _run_main_thread_job(job)
 
     try:
         # If this is called from init_unreal.py during editor startup, we're on the main thread.
@@ -129,6 +170,93 @@ def _ensure_main_thread_runner():
         _MAIN_THREAD_READY = False
 
 
+def _submit_main_thread_job(fn, key=None):
+    """Queue fn to run on the main thread, subject to admission control.
+
+    Returns (job, depth). job is None when the queue is full; depth is the
+    queue depth seen at admission. Jobs submitted with the same key while one
+    is still queued share that job and its result instead of running again.
+    """
+    with _MAIN_THREAD_LOCK:
+        if key is not None:
+            job = _MAIN_THREAD_INFLIGHT.get(key)
+            if job is not None:
+                job["waiters"] += 1
+                return job, len(_MAIN_THREAD_QUEUE)
+
+        # Jobs whose callers all gave up do not count against the limit.
+        if any(j["cancelled"] for j in _MAIN_THREAD_QUEUE):
+            _MAIN_THREAD_QUEUE[:] = [j for j in _MAIN_THREAD_QUEUE if not j["cancelled"]]
+
+        depth = len(_MAIN_THREAD_QUEUE)
+        if depth >= MAIN_THREAD_QUEUE_LIMIT:
+            return None, depth
+
+        job = {
+            "fn": fn,
+            "key": key,
+            "waiters": 1,
+            "cancelled": False,
+            "done": threading.Event(),
+            "out": None,
+        }
+        _MAIN_THREAD_QUEUE.append(job)
+        if key is not None:
+            _MAIN_THREAD_INFLIGHT[key] = job
+        return job, depth
+
+
+def _wait_main_thread_job(job, timeout):
+    """Wait for a job's result. On timeout, drop the job once no caller is left waiting."""
+    if job["done"].wait(timeout=timeout):
+        return job["out"]
+
+    with _MAIN_THREAD_LOCK:
+        # The job may have finished between the wait timing out and taking the lock.
+        if job["done"].is_set():
+            return job["out"]
+        job["waiters"] -= 1
+        if job["waiters"] <= 0:
+            job["cancelled"] = True
+            if _MAIN_THREAD_INFLIGHT.get(job["key"]) is job:
+                del _MAIN_THREAD_INFLIGHT[job["key"]]
+    return None
+
+
+def _run_main_thread_job(job):
+    with _MAIN_THREAD_LOCK:
+        if job["cancelled"]:
+            return
+        # Once running, later identical submissions must not attach to a stale result.
+        if job["key"] is not None and _MAIN_THREAD_INFLIGHT.get(job["key"]) is job:
+            del _MAIN_THREAD_INFLIGHT[job["key"]]
+
+    try:
+        out = job["fn"]()
+    except Exception as e:
+        _log_error(f"Main-thread task failed: {e}")
+        out = {"ok": False, "error": f"Main-thread task failed: {e}"}
+
+    if out is _MAIN_THREAD_REQUEUE:
+        # Already admitted; continuing sliced work bypasses the queue limit.
+        with _MAIN_THREAD_LOCK:
+            _MAIN_THREAD_QUEUE.append(job)
+        return
+
+    job["out"] = out
+    job["done"].set()
+
+
+def _busy_error(depth):
+    return {
+        "ok": False,
+        "busy": True,
+        "error": f"Editor busy: main-thread queue is full ({depth}/{MAIN_THREAD_QUEUE_LIMIT} jobs); retry later",
+        "queue_depth": depth,
+        "queue_limit": MAIN_THREAD_QUEUE_LIMIT,
+    }
+
+
 def _get_project_name():
     if unreal is not None:
         try:
@@ -359,6 +487,112 @@ def get_log_path(path=None):
     }
 
 
+# --- Log Archive ---
+
+def _archive_targets():
+    """Return (archive_dir, finished log files) for the directory of the current log."""
+    resolved, _searched = _resolve_log_file_path(use_cache=True)
+    if not resolved:
+        return ARCHIVE_DIR_OVERRIDE, []
+
+    logs_dir = os.path.dirname(resolved)
+    archive_dir = ARCHIVE_DIR_OVERRIDE or os.path.join(logs_dir, "MCPArchive")
+    # Everything except the file we are tailing is finished (backups, earlier sessions).
+    current = os.path.normcase(os.path.abspath(resolved))
+    finished = [
+        p for p in glob.glob(os.path.join(logs_dir, "*.log"))
+        if os.path.normcase(os.path.abspath(p)) != current
+    ]
+    return archive_dir, finished
+
+
+def archive_logs():
+    """Ingest finished log files into the compressed, indexed archive."""
+    if mcp_log_archive is None:
+        return {"ok": False, "error": "mcp_log_archive module not available"}
+
+    archive_dir, finished = _archive_targets()
+    if not archive_dir:
+        return {"ok": False, "error": "Could not resolve Unreal log directory"}
+
+    stats = mcp_log_archive.ingest_logs(finished, archive_dir, codec=ARCHIVE_CODEC)
+    stats.update({"ok": True, "archive": archive_dir})
+    return stats
+
+
+def search_log_archive(text=None, category=None, verbosity=None, since=None, until=None,
+                       limit=200, refresh=False):
+    """Search archived log sessions using the archive indexes.
+
+    Parameters:
+    - text: words that must all appear in a line (whole words, case-insensitive)
+    - category / verbosity: name or list, e.g. "LogShaderCompilers" / "Error"
+    - since / until: "7d", "24h", "2024-05-01", epoch seconds, ...
+    - limit: maximum matches returned
+    - refresh: archive newly finished logs before searching
+    """
+    if mcp_log_archive is None:
+        return {"ok": False, "error": "mcp_log_archive module not available"}
+
+    archive_dir = ARCHIVE_DIR_OVERRIDE or _archive_targets()[0]
+    if not archive_dir:
+        return {"ok": False, "error": "Could not resolve Unreal log directory"}
+
+    try:
+        if refresh:
+            # Bad UNREAL_MCP_ARCHIVE_CODEC (ValueError) or unwritable archive dir (OSError)
+            archive_logs()
+        out = mcp_log_archive.search_archive(
+            archive_dir,
+            text=text,
+            category=category,
+            verbosity=verbosity,
+            since=since,
+            until=until,
+            limit=limit,
+        )
+    except (ValueError, OSError) as e:
+        return {"ok": False, "error": str(e)}
+    out["archive"] = archive_dir
+    return out
+
+
+def _archiver_loop(stop):
+    # First pass shortly after startup, then every ARCHIVE_INTERVAL seconds.
+    delay = min(30.0, ARCHIVE_INTERVAL)
+    while not stop.wait(delay):
+        try:
+            stats = archive_logs()
+            if stats.get("ingested"):
+                _log_info(f"MCP log archive: ingested {stats['ingested']} log file(s) into {stats['archive']}")
+            for err in stats.get("errors", []):
+                _log_error(f"MCP log archive: {err}")
+        except Exception as e:
+            _log_error(f"MCP log archive pass failed: {e}")
+        delay = ARCHIVE_INTERVAL
+
+
+def start_archiver():
+    """Starts the background log archiver thread (no-op when disabled)."""
+    global _ARCHIVER_THREAD, _ARCHIVER_STOP
+
+    if mcp_log_archive is None or ARCHIVE_INTERVAL <= 0:
+        return
+    _ARCHIVER_STOP = threading.Event()
+    _ARCHIVER_THREAD = threading.Thread(target=_archiver_loop, args=(_ARCHIVER_STOP,), daemon=True)
+    _ARCHIVER_THREAD.start()
+
+
+def _stop_archiver():
+    global _ARCHIVER_THREAD, _ARCHIVER_STOP
+
+    stop = _ARCHIVER_STOP
+    _ARCHIVER_THREAD = None
+    _ARCHIVER_STOP = None
+    if stop is not None:
+        stop.set()
+
+
 def exec_python(code, mode="exec"):
     """Execute Python inside Unreal and return output.
 
@@ -455,11 +689,7 @@ def exec_python(code, mode="exec"):
             },
         }
 
-    done = threading.Event()
-    out = {}
-
     def _job():
-        nonlocal out
         out = _run()
         try:
             current_ident = _safe_get_ident()
@@ -471,13 +701,23 @@ def exec_python(code, mode="exec"):
             }
         except Exception:
             pass
-        done.set()
+        return out
 
-    with _MAIN_THREAD_LOCK:
-        _MAIN_THREAD_QUEUE.append(_job)
+    # Identical eval requests are treated as read-only: concurrent callers share one run.
+    key = None
+    if mode == "eval":
+        import hashlib
+        key = ("eval", hashlib.sha1(code_str.encode("utf-8", errors="replace")).hexdigest())
+
+    job, depth = _submit_main_thread_job(_job, key=key)
+    if job is None:
+        out = _busy_error(depth)
+        out.update({"mode": mode, "stdout": "", "stderr": ""})
+        return out
 
     # Wait for result (avoid hanging the server thread forever)
-    if not done.wait(timeout=10.0):
+    out = _wait_main_thread_job(job, EXEC_TIMEOUT)
+    if out is None:
         current_ident = _safe_get_ident()
         return {
             "ok": False,
@@ -485,6 +725,7 @@ def exec_python(code, mode="exec"):
             "stdout": "",
             "stderr": "",
             "error": "Timed out waiting for main-thread execution",
+            "queue_depth": depth,
             "thread": {
                 "current_ident": current_ident,
                 "runner_ident": _MAIN_THREAD_IDENT,
@@ -493,6 +734,361 @@ def exec_python(code, mode="exec"):
             },
         }
 
+    # Every caller gets its own copy; the result value itself is shared.
+    out = dict(out)
+    if job["waiters"] > 1:
+        out["coalesced"] = job["waiters"]
+    return out
+
+
+# --- Scene Snapshots ---
+
+def _get_level_actors():
+    try:
+        subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+        if subsystem is not None:
+            return list(subsystem.get_all_level_actors())
+    except Exception:
+        pass
+    return list(unreal.EditorLevelLibrary.get_all_level_actors())
+
+
+def _hashable_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    try:
+        return str(value)
+    except Exception:
+        return repr(value)
+
+
+def _actor_state(actor, properties):
+    """Return (path, state) for an actor; state is a hashable tuple of what we track."""
+    loc = actor.get_actor_location()
+    rot = actor.get_actor_rotation()
+    scale = actor.get_actor_scale3d()
+
+    values = []
+    for name in properties:
+        try:
+            values.append(_hashable_value(actor.get_editor_property(name)))
+        except Exception:
+            values.append(None)
+
+    state = (
+        str(actor.get_actor_label()),
+        str(actor.get_class().get_name()),
+        (float(loc.x), float(loc.y), float(loc.z)),
+        (float(rot.roll), float(rot.pitch), float(rot.yaw)),
+        (float(scale.x), float(scale.y), float(scale.z)),
+        tuple(values),
+    )
+    return str(actor.get_path_name()), state
+
+
+def _describe_actor(path, state, properties):
+    label, cls, loc, rot, scale, values = state
+    desc = {
+        "path": path,
+        "label": label,
+        "class": cls,
+        "location": list(loc),
+        "rotation": list(rot),
+        "scale": list(scale),
+    }
+    if properties:
+        desc["properties"] = dict(zip(properties, values))
+    return desc
+
+
+def _scene_store(properties):
+    """Return the fingerprint store for a properties tuple, creating it if needed. Main thread only.
+
+    Each property list has its own fingerprints, journal and token epoch, so
+    callers tracking different properties never invalidate each other's tokens.
+    """
+    store = _SCENE_STORES.get(properties)
+    if store is not None:
+        _SCENE_STORES.move_to_end(properties)
+        return store
+
+    store = {
+        "epoch": os.urandom(4).hex(),  # Tokens of other stores, sessions or reloads never match
+        "version": 0,
+        "floor": 0,  # Oldest version the journal can still diff against
+        "fingerprints": {},  # actor path -> int fingerprint
+        "journal": [],  # (version, actor path, kind) with kind "+", "~" or "-"
+    }
+    _SCENE_STORES[properties] = store
+    while len(_SCENE_STORES) > SCENE_STORE_LIMIT:
+        _SCENE_STORES.popitem(last=False)
+    return store
+
+
+def _parse_scene_token(store, token):
+    """Return the version a token refers to, or None if it cannot be diffed against."""
+    if not token:
+        return None
+    try:
+        epoch, _sep, version = str(token).rpartition("-")
+        version = int(version)
+    except Exception:
+        return None
+    if epoch != store["epoch"] or version < store["floor"] or version > store["version"]:
+        return None
+    return version
+
+
+def _scene_journal_since(store, version):
+    """Map actor path -> kind of its first journal entry after version."""
+    import bisect
+
+    journal = store["journal"]
+    first = {}
+    start = bisect.bisect_left(journal, (version + 1,))
+    for _ver, path, kind in journal[start:]:
+        if path not in first:
+            first[path] = kind
+    return first
+
+
+def _commit_scene_scan(store, seen, changes, reset):
+    """Store a finished scan's fingerprints and journal its changes. Main thread only."""
+    journal = store["journal"]
+    if reset:
+        store["version"] += 1
+        store["floor"] = store["version"]
+        del journal[:]
+    elif changes:
+        store["version"] += 1
+        version = store["version"]
+        journal.extend((version, path, kind) for path, kind in changes)
+        if len(journal) > SCENE_JOURNAL_LIMIT:
+            cut = len(journal) - SCENE_JOURNAL_LIMIT // 2
+            store["floor"] = journal[cut][0]
+            del journal[:cut]
+
+    store["fingerprints"] = seen
+
+
+def scene_snapshot(since=None, properties=None, budget_ms=SCENE_SLICE_BUDGET_MS):
+    """Return the level actors added, removed or modified since a prior version token.
+
+    Parameters:
+    - since: token returned by a previous call; omit for a full snapshot
+    - properties: optional list of editor property names folded into each fingerprint
+    - budget_ms: main-thread time spent fingerprinting per editor tick
+
+    Fingerprints are kept server-side per properties list, so only changed
+    actors are described. A missing, stale or unknown token (editor restart,
+    journal trimmed, other properties) returns a full snapshot with
+    "reset": true; it is still diffed against the stored fingerprints, so
+    other clients' tokens stay valid.
+    """
+    if unreal is None:
+        return {
+            "ok": False,
+            "error": "unreal module not available",
+        }
+
+    if properties is None:
+        properties = ()
+    elif isinstance(properties, str):
+        properties = (properties,)
+    properties = tuple(str(p) for p in properties)
+
+    try:
+        budget = max(0.5, min(float(budget_ms), 100.0))
+    except (ValueError, TypeError):
+        budget = SCENE_SLICE_BUDGET_MS
+
+    import time
+
+    # Actor enumeration must happen on the main thread.
+    _ensure_main_thread_runner()
+
+    scan = {
+        "store": None,
+        "actors": None,
+        "index": 0,
+        "slices": 0,
+        "base": None,
+        "wanted": None,
+        "since_version": None,
+        "reset": False,
+        "full": False,
+        "seen": {},
+        "states": {},
+        "changes": [],
+        "added": 0,
+    }
+    started = time.perf_counter()
+
+    def _begin():
+        store = _scene_store(properties)
+        since_version = _parse_scene_token(store, since)
+        # reset: first scan of this store, nothing to diff against.
+        # full: describe every actor to this caller.
+        reset = store["version"] == 0
+        full = reset or since_version is None
+        scan["store"] = store
+        scan["actors"] = _get_level_actors()
+        scan["base"] = store["fingerprints"]
+        scan["since_version"] = since_version
+        scan["reset"] = reset
+        scan["full"] = full
+        scan["wanted"] = {} if full else _scene_journal_since(store, since_version)
+
+    def _finish():
+        store = scan["store"]
+        base = scan["base"]
+        if base is not store["fingerprints"]:
+            return {
+                "ok": False,
+                "error": "Scene fingerprints changed during scan (concurrent snapshot); retry",
+            }
+
+        seen = scan["seen"]
+        states = scan["states"]
+        changes = scan["changes"]
+        reset = scan["reset"]
+        full = scan["full"]
+
+        # Every unchanged actor is in both maps, so a count mismatch means removals.
+        if not reset and len(seen) - scan["added"] != len(base):
+            for path in base:
+                if path not in seen:
+                    changes.append((path, "-"))
+
+        _commit_scene_scan(store, seen, changes, reset)
+
+        added, modified, removed = [], [], []
+        if full:
+            for path, state in states.items():
+                added.append(_describe_actor(path, state, properties))
+        else:
+            first = scan["wanted"]
+            for path, kind in changes:
+                if path not in first:
+                    first[path] = kind
+            for path, kind in first.items():
+                existed = kind != "+"
+                if path in seen:
+                    desc = _describe_actor(path, states[path], properties)
+                    (modified if existed else added).append(desc)
+                elif existed:
+                    removed.append(path)
+
+        return {
+            "ok": True,
+            "token": f"{store['epoch']}-{store['version']}",
+            "since": since,
+            "reset": full,
+            "actor_count": len(seen),
+            "added": added,
+            "modified": modified,
+            "removed": removed,
+            "scan": {
+                "slices": scan["slices"],
+                "budget_ms": budget,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
+            },
+        }
+
+    def _slice():
+        """Fingerprint actors until the budget is spent, then re-queue or finish."""
+        try:
+            deadline = time.perf_counter() + budget / 1000.0
+            scan["slices"] += 1
+            if scan["actors"] is None:
+                _begin()
+
+            actors = scan["actors"]
+            base = scan["base"]
+            wanted = scan["wanted"]
+            reset = scan["reset"]
+            keep_all = scan["full"]
+            seen = scan["seen"]
+            states = scan["states"]
+            changes = scan["changes"]
+
+            i = scan["index"]
+            count = len(actors)
+            while i < count:
+                try:
+                    path, state = _actor_state(actors[i], properties)
+                except Exception:
+                    # Actor destroyed or not inspectable; treat it as gone.
+                    path = None
+                i += 1
+                if path is not None:
+                    fp = hash(state)
+                    seen[path] = fp
+                    changed = False
+                    if not reset:
+                        prev = base.get(path)
+                        if prev is None:
+                            changes.append((path, "+"))
+                            scan["added"] += 1
+                            changed = True
+                        elif prev != fp:
+                            changes.append((path, "~"))
+                            changed = True
+                    if keep_all or changed or path in wanted:
+                        states[path] = state
+                if (i & 63) == 0 and time.perf_counter() >= deadline:
+                    break
+            scan["index"] = i
+
+            if i < count:
+                return _MAIN_THREAD_REQUEUE
+            return _finish()
+        except Exception as e:
+            import traceback
+            return {
+                "ok": False,
+                "error": str(e),
+                "traceback": traceback.format_exc(),
+            }
+
+    # Already on the runner thread: run every slice now to avoid waiting on ourselves.
+    # Never take _SCENE_LOCK here; its holder may be waiting on this very thread.
+    # A request scan interleaved with ours fails the base check in _finish instead.
+    current_ident = _safe_get_ident()
+    if _MAIN_THREAD_IDENT is not None and current_ident == _MAIN_THREAD_IDENT:
+        out = _slice()
+        while out is _MAIN_THREAD_REQUEUE:
+            out = _slice()
+        return out
+
+    if not _MAIN_THREAD_READY:
+        return {
+            "ok": False,
+            "error": "Main-thread runner not available; cannot enumerate level actors from MCP request thread",
+        }
+
+    if not _SCENE_LOCK.acquire(timeout=SCENE_LOCK_TIMEOUT):
+        return {
+            "ok": False,
+            "busy": True,
+            "error": "Editor busy: another scene snapshot is in progress; retry later",
+        }
+    try:
+        job, depth = _submit_main_thread_job(_slice)
+        if job is None:
+            return _busy_error(depth)
+
+        # A timed-out scan is cancelled before its next slice, so it never commits.
+        out = _wait_main_thread_job(job, SCENE_SNAPSHOT_TIMEOUT)
+        if out is None:
+            return {
+                "ok": False,
+                "error": "Timed out waiting for main-thread scene scan",
+                "scan": {"slices": scan["slices"], "budget_ms": budget},
+            }
+    finally:
+        _SCENE_LOCK.release()
+
     return out
 
 
@@ -506,15 +1102,73 @@ def _port_is_open(host, port, timeout=0.15):
         return False
 
 
+def _register_instance():
+    """Advertise this server in the machine-wide registry (see mcp_registry.py)."""
+    if mcp_registry is None:
+        return
+    extra = {}
+    if _UDS_PATH:
+        extra["socket"] = _UDS_PATH
+    try:
+        mcp_registry.register_instance(MCP_PORT, project=_get_project_name(), **extra)
+    except Exception as e:
+        _log_error(f"Failed to write MCP instance registry entry: {e}")
+
+
+def _unregister_instance():
+    if mcp_registry is None:
+        return
+    try:
+        mcp_registry.unregister_instance(MCP_PORT)
+    except Exception:
+        pass
+
+
+def _stop_uds_server():
+    global _UDS_SERVER, _UDS_THREAD, _UDS_PATH
+
+    srv = _UDS_SERVER
+    thr = _UDS_THREAD
+    path = _UDS_PATH
+    _UDS_SERVER = None
+    _UDS_THREAD = None
+    _UDS_PATH = None
+
+    if srv is not None:
+        try:
+            srv.shutdown()
+        except Exception:
+            pass
+        try:
+            srv.server_close()
+        except Exception:
+            pass
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    if thr is not None:
+        try:
+            thr.join(timeout=1.0)
+        except Exception:
+            pass
+
+
 def _stop_server():
     global _SERVER, _SERVER_THREAD
 
+    _stop_archiver()
+    _stop_uds_server()
+
     srv = _SERVER
     thr = _SERVER_THREAD
     _SERVER = None
     _SERVER_THREAD = None
 
     if srv is not None:
+        _unregister_instance()
         try:
             srv.shutdown()
         except Exception:
@@ -609,6 +1263,65 @@ MCP_TOOLS = {
             },
             "required": ["code"]
         }
+    },
+    "unreal_logs/scene_snapshot": {
+        "description": "Returns level actors added, removed or modified since a prior version token (full snapshot when omitted or stale). Fingerprints transform, label, class and optional properties.",
+        "function": scene_snapshot,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "string",
+                    "description": "Version token from a previous scene_snapshot call."
+                },
+                "properties": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional editor property names to include in each actor fingerprint."
+                },
+                "budget_ms": {
+                    "type": "number",
+                    "description": f"Main-thread milliseconds spent fingerprinting per editor tick (default {SCENE_SLICE_BUDGET_MS})."
+                }
+            }
+        }
+    },
+    "unreal_logs/search_log_archive": {
+        "description": "Searches archived past editor log sessions (rotated backups, earlier runs) via a compressed, indexed archive. Filter by words, category, verbosity and time range.",
+        "function": search_log_archive,
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Words that must all appear in the line (whole words, case-insensitive)."
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Log category, e.g. 'LogShaderCompilers'."
+                },
+                "verbosity": {
+                    "type": "string",
+                    "description": "Verbosity: Fatal, Error, Warning, Display, Log, Verbose or VeryVerbose."
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Start of the time range (UTC): relative like '7d' or '24h', a date like '2024-05-01', or epoch seconds."
+                },
+                "until": {
+                    "type": "string",
+                    "description": "End of the time range, same formats as since."
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum matches to return (default 200)."
+                },
+                "refresh": {
+                    "type": "boolean",
+                    "description": "Archive newly finished log files before searching."
+                }
+            }
+        }
     }
 }
 
@@ -617,7 +1330,15 @@ MCP_TOOLS = {
 
 class MCPHandler(http.server.BaseHTTPRequestHandler):
     """Handles HTTP requests for the Model Context Protocol (MCP)."""
-    
+
+    # HTTP/1.1 keeps connections alive so clients (e.g. mcp_gateway.py) can pool
+    # them; every response therefore carries a Content-Length.
+    protocol_version = "HTTP/1.1"
+    timeout = 120  # Close idle keep-alive connections
+    # Headers and body are written separately; without TCP_NODELAY a reused
+    # connection stalls on delayed ACKs for ~40ms per response.
+    disable_nagle_algorithm = True
+
     # Disable logging to prevent infinite log loop inside Unreal
     def log_message(self, format, *args):
         pass
@@ -625,10 +1346,6 @@ class MCPHandler(http.server.BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle tool discovery request (GET /mcp)."""
         if self.path == '/mcp':
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            
             resolved, _ = _resolve_log_file_path(use_cache=True)
 
             tool_definitions = []
@@ -644,7 +1361,7 @@ class MCPHandler(http.server.BaseHTTPRequestHandler):
                 })
                 
             response = {"tools": tool_definitions}
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self._send_json(200, response)
         else:
             self._send_404()
 
@@ -672,10 +1389,7 @@ class MCPHandler(http.server.BaseHTTPRequestHandler):
                         # Fallback for older Python versions or inspect issues
                         result = tool_data["function"](**arguments)
                     
-                    self.send_response(200)
-                    self.send_header("Content-type", "application/json")
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"result": result}).encode('utf-8'))
+                    self._send_json(200, {"result": result})
                 else:
                     self._send_400(f"Tool not found or invalid: {tool_name}")
             
@@ -685,21 +1399,94 @@ class MCPHandler(http.server.BaseHTTPRequestHandler):
         else:
             self._send_404()
 
-    def _send_400(self, message):
-        self.send_response(400)
+    def _send_json(self, status, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(status)
         self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps({"error": message}).encode('utf-8'))
-        
+        self.wfile.write(body)
+
+    def _send_400(self, message):
+        self._send_json(400, {"error": message})
+
     def _send_404(self):
         self.send_response(404)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def _send_500(self, message):
-        self.send_response(500)
-        self.send_header("Content-type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps({"error": message}).encode('utf-8'))
+        self._send_json(500, {"error": message})
+
+
+class _UnixMCPHandler(MCPHandler):
+    """MCPHandler served over a Unix domain socket."""
+
+    # TCP_NODELAY does not apply to AF_UNIX sockets (setsockopt would fail).
+    disable_nagle_algorithm = False
+
+
+def _socket_in_use(path):
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(0.15)
+            s.connect(path)
+            return True
+    except Exception:
+        return False
+
+
+def start_uds_server(path):
+    """Starts the MCP HTTP server on a Unix domain socket in a daemon thread.
+
+    The socket file is restricted to the current user (0600) before it starts
+    listening. Returns True when the server is running.
+    """
+    global _UDS_SERVER, _UDS_THREAD, _UDS_PATH
+
+    server_cls = getattr(socketserver, "ThreadingUnixStreamServer", None)
+    if server_cls is None:
+        _log_error("Unix domain sockets are not supported on this platform; UNREAL_MCP_SOCKET ignored.")
+        return False
+
+    path = os.path.abspath(os.path.expanduser(
+        path.replace("{port}", str(MCP_PORT)).replace("{pid}", str(os.getpid()))
+    ))
+    try:
+        import stat
+
+        if os.path.exists(path):
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise OSError(f"{path} exists and is not a socket")
+            if _socket_in_use(path):
+                raise OSError(f"{path} is in use by another server")
+            # Left behind by a server that did not shut down cleanly.
+            os.remove(path)
+
+        class ThreadingUnixHTTPServer(server_cls):
+            daemon_threads = True
+
+        server = ThreadingUnixHTTPServer(path, _UnixMCPHandler, bind_and_activate=False)
+        try:
+            server.server_bind()
+            # Restrict access before accepting connections: exec runs arbitrary code.
+            os.chmod(path, 0o600)
+            server.server_activate()
+        except Exception:
+            server.server_close()
+            raise
+    except Exception as e:
+        _log_error(f"Failed to start MCP Server on Unix socket {path}: {e}")
+        return False
+
+    _UDS_SERVER = server
+    _UDS_PATH = path
+    _UDS_THREAD = threading.Thread(target=server.serve_forever, daemon=True)
+    _UDS_THREAD.start()
+    _log_info(f"MCP Server also listening on Unix socket {path}")
+    return True
 
 
 # Helper to run server in its own thread
@@ -717,6 +1504,9 @@ def start_mcp_server():
         # We bind to 0.0.0.0 to listen on all interfaces
         server = ThreadingHTTPServer(("127.0.0.1", MCP_PORT), MCPHandler)
         _SERVER = server
+        if MCP_SOCKET_PATH:
+            start_uds_server(MCP_SOCKET_PATH)
+        _register_instance()
         _log_info(f"Starting MCP Server (File Reader) on port {MCP_PORT}...")
         server.serve_forever()
     except Exception as e:
@@ -732,9 +1522,25 @@ if os.getenv("UNREAL_MCP_DISABLE_SERVER") != "1":
     _SERVER_THREAD.start()
     _log_info(f"MCP Log Forwarder (Server Thread) started on port {MCP_PORT}. Access via http://localhost:{MCP_PORT}")
 
+    start_archiver()
+
+    import atexit
+    atexit.register(_unregister_instance)
+    atexit.register(_stop_uds_server)
+
 # Ensure main-thread runner is registered as early as possible.
 # init_unreal.py runs on editor startup (main thread), so this should succeed.
 try:
     _ensure_main_thread_runner()
 except Exception:
     pass
+
+
+if __name__ == "__main__":
+    # Headless mode (no Unreal): serve the log tools until interrupted, e.g.
+    #   UNREAL_MCP_PORT=3002 UNREAL_PROJECT_NAME=Test python mcp_log_forwarder.py
+    try:
+        while _SERVER_THREAD is not None and _SERVER_THREAD.is_alive():
+            _SERVER_THREAD.join(timeout=0.5)
+    except KeyboardInterrupt:
+        _stop_server()
@@ -0,0 +1,160 @@
+"""Registry of MCP Log Forwarder servers running on this machine.
+
+Every server writes one small JSON file (port, pid, project) into the
+registry directory while it is running, so tools outside Unreal such as
+mcp_gateway.py can find each editor instance without knowing its port.
+"""
+import os
+import json
+import time
+import socket
+
+# Override with UNREAL_MCP_REGISTRY_DIR (shared by the editor and the gateway).
+REGISTRY_DIR = os.getenv("UNREAL_MCP_REGISTRY_DIR") or os.path.join(
+    os.path.expanduser("~"), ".unreal_mcp", "instances"
+)
+
+
+def _entry_path(pid, port):
+    return os.path.join(REGISTRY_DIR, f"{int(pid)}-{int(port)}.json")
+
+
+PROBE_TIMEOUT = 0.25  # Seconds to wait for a server's port to accept a connection
+
+
+def _pid_alive_windows(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied: the process exists but belongs to someone else.
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid):
+    # On Windows os.kill() terminates the target process, so we cannot probe with it.
+    if os.name == "nt":
+        try:
+            return _pid_alive_windows(int(pid))
+        except Exception:
+            return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except Exception:
+        # PermissionError etc.: the process exists but belongs to someone else.
+        return True
+    return True
+
+
+def _port_open(entry):
+    """True when the entry's server accepts connections (catches reused pids)."""
+    try:
+        with socket.create_connection(
+            (entry.get("host") or "127.0.0.1", int(entry["port"])), timeout=PROBE_TIMEOUT
+        ):
+            return True
+    except OSError:
+        return False
+
+
+def register_instance(port, project=None, host="127.0.0.1", **extra):
+    """Write (or refresh) the registry entry for this process's server. Returns its path."""
+    pid = os.getpid()
+    entry = {
+        "port": int(port),
+        "pid": pid,
+        "project": project,
+        "host": host,
+        "started": time.time(),
+    }
+    entry.update(extra)
+
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    path = _entry_path(pid, port)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    # Atomic so readers never see a half-written entry.
+    os.replace(tmp, path)
+    return path
+
+
+def unregister_instance(port, pid=None):
+    """Remove the registry entry for a server; missing entries are ignored."""
+    try:
+        os.remove(_entry_path(os.getpid() if pid is None else pid, port))
+    except OSError:
+        pass
+
+
+def list_instances(prune=True):
+    """Return registry entries of running servers, oldest first.
+
+    Entries whose process no longer exists are skipped, as are all but the
+    newest entry for a port; with prune=True those are deleted. Entries whose
+    port does not accept a connection right now (a reused pid, or an editor too
+    busy to accept) are only skipped: the editor writes its entry once, so
+    deleting it would hide a live editor for good.
+    """
+    try:
+        names = os.listdir(REGISTRY_DIR)
+    except OSError:
+        return []
+
+    def _remove(path):
+        if prune:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    newest = {}  # (host, port) -> (entry, path)
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(REGISTRY_DIR, name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            int(entry["port"])
+        except Exception:
+            continue
+
+        if not _pid_alive(entry.get("pid", 0)):
+            _remove(path)
+            continue
+
+        # Only one server can listen on a port; older entries for it are stale.
+        key = (entry.get("host") or "127.0.0.1", int(entry["port"]))
+        other = newest.get(key)
+        if other is not None:
+            if (other[0].get("started") or 0) >= (entry.get("started") or 0):
+                _remove(path)
+                continue
+            _remove(other[1])
+        newest[key] = (entry, path)
+
+    entries = [entry for entry, _path in newest.values() if _port_open(entry)]
+
+    entries.sort(key=lambda e: (e.get("started") or 0, e["port"]))
+    return entries
@@ -0,0 +1,33 @@
+"""Stand-in `unreal` module for running the MCP server outside Unreal.
+
+Used by bench_transport.py and check_gateway.py. It provides logging and an
+editor tick callback driven by a background thread, so the main-thread queue
+(exec, scene_snapshot) works in a plain Python process. Install it before
+importing mcp_log_forwarder; the project name comes from UNREAL_PROJECT_NAME.
+"""
+import sys
+import time
+import types
+import threading
+
+TICK_SECONDS = 0.0005  # Stand-in editor tick interval
+
+
+def install(tick_seconds=TICK_SECONDS):
+    """Register the stand-in as sys.modules["unreal"] and return it."""
+    unreal = types.ModuleType("unreal")
+    unreal.log = lambda msg: None
+    unreal.log_error = lambda msg: print("ERROR: " + str(msg))
+
+    def register_editor_tick_callback(fn):
+        def loop():
+            while True:
+                fn(tick_seconds)
+                time.sleep(tick_seconds)
+
+        threading.Thread(target=loop, daemon=True).start()
+        return fn
+
+    unreal.register_editor_tick_callback = register_editor_tick_callback
+    sys.modules["unreal"] = unreal
+    return unreal